@@ -19,22 +19,18 @@ import argparse
 import sys
 import re
 import json
-import pkg_resources
 import collections
-
-import six
-import codecs
+import functools
+import importlib.resources
 
 def _get_version():
-    if not pkg_resources.resource_exists(__name__, '_version'):
+    version_file = importlib.resources.files(__name__).joinpath('_version')
+    if not version_file.is_file():
         return '0.0.0'
-    with pkg_resources.resource_stream(__name__, '_version') as fp:
-        return codecs.getreader('utf-8')(fp).read().strip()
+    return version_file.read_text('utf-8').strip()
 __version__ = _get_version()
 
-with pkg_resources.resource_stream(__name__, 'config.json') as fp:
-    _reader = codecs.getreader('utf-8')
-    CONFIG = json.load(_reader(fp))
+_CONFIG = None
 """The config file is a JSON object with a single key "services" containing
 a list of objects of the form
 {
@@ -43,59 +39,127 @@ a list of objects of the form
   "region": <bool, assumed true if absent>,
   "account": <bool, assumed true if absent>
 }
+It is loaded on first use and exposed as the module attribute CONFIG.
 """
 
+def _get_config():
+    global _CONFIG
+    if _CONFIG is None:
+        _CONFIG = json.loads(importlib.resources.files(__name__).joinpath('config.json').read_bytes())
+    return _CONFIG
+
+def __getattr__(name):
+    if name == 'CONFIG':
+        return _get_config()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+_service_rule = collections.namedtuple('ServiceRule', ['resource_re', 'has_region', 'has_account'])
+
+_DEFAULT_RULE = _service_rule(None, True, True)
+
+def _build_service_index(config):
+    """Convert the config into a dict mapping each service namespace to a tuple
+    (resource_rules, default_rule). The resource rules are those with a resource
+    regex, precompiled, in file order, up to the first rule without one, which is
+    the default. Rules after that can never match, and are dropped.
+    The service namespaces are interned, so lookups with literal or
+    already-interned service names compare by identity."""
+    index = {}
+    for service_config in config['services']:
+        service = sys.intern(service_config['service'])
+        resource_rules, default_rule = index.get(service, ((), None))
+        if default_rule is not None:
+            continue
+        resource = service_config.get('resource')
+        rule = _service_rule(
+            re.compile(resource) if resource is not None else None,
+            service_config.get('region', True),
+            service_config.get('account', True))
+        if resource is None:
+            default_rule = rule
+        else:
+            resource_rules += (rule,)
+        index[service] = (resource_rules, default_rule)
+    return dict((service, (resource_rules, default_rule or _DEFAULT_RULE))
+                for service, (resource_rules, default_rule) in index.items())
+
+_SERVICE_INDEX = None
+
+def _get_service_index():
+    global _SERVICE_INDEX
+    if _SERVICE_INDEX is None:
+        _SERVICE_INDEX = _build_service_index(_get_config())
+    return _SERVICE_INDEX
+
 _arn_tuple = collections.namedtuple('ARN', ['partition', 'service', 'region', 'account', 'resource'])
 
 def split(arn):
     """Return a namedtuple of the parts of the ARNs"""
-    return _arn_tuple(*arn.split(':', 5)[1:])
+    parts = arn.split(':', 5)
+    return _arn_tuple(parts[1], parts[2], parts[3], parts[4], parts[5])
+
+_ARN_RE = re.compile(r'arn:([^:]*):([^:]*):([^:]*):([^:]*):(.*)', re.DOTALL)
 
+def _invalid_arn(arn):
+    raise ValueError("Invalid ARN: {!r}".format(arn))
+
+def split_many(arns):
+    """Return a list of namedtuples of the parts of each of the given ARNs.
+    Unlike split(), raises ValueError if any of them is not a valid ARN."""
+    match = _ARN_RE.fullmatch
+    make = _arn_tuple._make
+    return [make((match(arn) or _invalid_arn(arn)).groups()) for arn in arns]
+
+# Internal callers pass all arguments positionally: keyword arguments make
+# lru_cache build a larger key, which roughly doubles the cost of a cache hit.
+@functools.lru_cache(maxsize=1024)
 def arn_config(service, resource, force_region=None, force_account=None):
     """Determine whether the ARN for the given service and resource requires
     a region and/or an account specified."""
-    arn_has_region = True
-    arn_has_account = True
-    
-    for service_config in CONFIG['services']:
-        if service_config['service'] == service:
-            if 'resource' in service_config and not re.search(service_config['resource'], resource):
-                continue
-            arn_has_region = service_config.get('region', True)
-            arn_has_account = service_config.get('account', True)
-            
+    resource_rules, rule = _get_service_index().get(service, ((), _DEFAULT_RULE))
+    
+    for resource_rule in resource_rules:
+        if resource_rule.resource_re.search(resource):
+            rule = resource_rule
             break
     
-    if force_region:
+    if force_region is None and force_account is None:
+        return rule.has_region, rule.has_account
+    
+    arn_has_region = rule.has_region
+    arn_has_account = rule.has_account
+    
+    if force_region is not None:
         arn_has_region = force_region
     
-    if force_account:
+    if force_account is not None:
         arn_has_account = force_account
     
     return arn_has_region, arn_has_account
 
-def arn(service, resource, region=None, account=None, profile=None, partition=None, force_region=None, force_account=None, on_error=None):
-    """Construct an ARN for the given service and resource.
-    The ARN format is arn:{partition}:{service}:{region}:{account-id}:{resource-id}
-    Some services, and some resources within services, exclude either or both of
-    region and account. Given a service, a resource, and the appropriate other data
-    this function will format the ARN appropriately, ignoring the region or account
-    as necessary.
-    Note that the service is given as the service namespace, which is most often
-    the service name in all lowercase, but consult the AWS docs if you are unsure.
-    This is also the service name used in the SDK.
-    Given a profile name, it will use boto3 to determine the region and account
-    associated with that profile, if they are required and not already specified.
-    """
+@functools.lru_cache(maxsize=None)
+def _get_session(profile):
+    import boto3
+    return boto3.Session(profile_name=profile)
+
+@functools.lru_cache(maxsize=None)
+def _get_sts_client(profile):
+    return _get_session(profile).client('sts')
+
+@functools.lru_cache(maxsize=None)
+def _get_account_for_profile(profile):
+    return _get_sts_client(profile).get_caller_identity()['Account']
+
+def _arn_prefix(service, resource, region, account, profile, partition, force_region, force_account, on_error):
+    """Return the ARN for the given service and resource up to (but not including)
+    the resource, using the resource only to look up the config."""
     
     partition = partition or 'aws'
     
-    arn_has_region, arn_has_account = arn_config(service, resource, force_region=force_region, force_account=force_account)
+    arn_has_region, arn_has_account = arn_config(service, resource, force_region, force_account)
     
     missing = []
     
-    session = None
-    
     def err(msg):
         if on_error:
             return on_error(msg)
@@ -106,9 +170,10 @@ def arn(service, resource, region=None, account=None, profile=None, partition=No
         region = ''
     elif not region:
         if profile:
-            import boto3
-            session = session or boto3.Session(profile_name=profile)
-            region = session.region_name
+            try:
+                region = _get_session(profile).region_name
+            except ImportError:
+                err("Error: boto3 is not installed")
         else:
             missing.append('region')
         
@@ -117,52 +182,62 @@ def arn(service, resource, region=None, account=None, profile=None, partition=No
     elif not account:
         if profile:
             try:
-                import boto3
-            except:
+                account = _get_account_for_profile(profile)
+            except ImportError:
                 err("Error: boto3 is not installed")
-            session = session or boto3.Session(profile_name=profile)
-            try:
-                account = session.client('sts').get_caller_identity()['Account']
             except Exception as e:
                 err("Error using profile to get account: {}".format(e))
         else:
             missing.append('account')
     elif account != '*':
-        account = '{:0>12}'.format(account)
+        account = str(account).zfill(12)
     else:
         account = ''
         
     if missing:
         err("Error: {} required".format(' and '.join(missing)))
     
-    return 'arn:{partition}:{service}:{region}:{account}:{resource}'.format(**{
-        'partition': partition,
-        'service': service,
-        'region': region,
-        'account': account,
-        'resource': resource,
-    })
+    return f'arn:{partition}:{service}:{region}:{account}:'
 
-def cloudformation(service, resource, force_region=None, force_account=None):
-    """Output an object to build the ARN, suitable for use in a CloudFormation template.
-    Unlike the other functions in this module, the resource can be specified as a list
-    of parts, which will be joined without a separator. For example:
-    aws_arn.cloudformation('dynamodb', ['table/', {'Ref': 'MyTable'}])
+def arn(service, resource, region=None, account=None, profile=None, partition=None, force_region=None, force_account=None, on_error=None):
+    """Construct an ARN for the given service and resource.
+    The ARN format is arn:{partition}:{service}:{region}:{account-id}:{resource-id}
+    Some services, and some resources within services, exclude either or both of
+    region and account. Given a service, a resource, and the appropriate other data
+    this function will format the ARN appropriately, ignoring the region or account
+    as necessary.
+    Note that the service is given as the service namespace, which is most often
+    the service name in all lowercase, but consult the AWS docs if you are unsure.
+    This is also the service name used in the SDK.
+    Given a profile name, it will use boto3 to determine the region and account
+    associated with that profile, if they are required and not already specified.
     """
     
-    if isinstance(resource, six.string_types):
-        resource = [resource]
-    
-    if isinstance(resource[0], six.string_types):
-        resource_for_config = resource[0]
-    else:
-        resource_for_config = ''
+    return _arn_prefix(service, resource, region, account, profile, partition,
+                       force_region, force_account, on_error) + resource
+
+def arn_formatter(service, resource, region=None, account=None, profile=None, partition=None, force_region=None, force_account=None, on_error=None):
+    """Return a function that takes a resource and constructs its ARN.
+    The arguments are the same as for arn(), and the region and account are
+    resolved once, up front, so this is faster than calling arn() repeatedly.
+    The given resource is used only to determine whether the ARN has a region
+    and an account, so the returned function should only be used for resources
+    of the same type. For example:
+    table_arn = aws_arn.arn_formatter('dynamodb', 'table/', region='us-east-1', account='123456789012')
+    table_arn('table/MyTable')
+    """
     
-    arn_has_region, arn_has_account = arn_config(service, resource_for_config,
-                    force_region=force_region, force_account=force_account)
+    prefix = _arn_prefix(service, resource, region, account, profile, partition,
+                         force_region, force_account, on_error)
     
-    region = {'Ref': 'AWS::Region'} if arn_has_region else ''
+    def format_arn(resource):
+        return prefix + resource
     
+    return format_arn
+
+@functools.lru_cache(maxsize=None)
+def _cfn_prefix(service, arn_has_region, arn_has_account):
+    """Return the parts of a CloudFormation ARN that precede the resource"""
     parts = [
         'arn:',
         {'Ref': 'AWS::Partition'},
@@ -191,12 +266,55 @@ def cloudformation(service, resource, force_region=None, force_account=None):
     else:
         parts.append(':{}:::'.format(service))
     
+    return tuple(parts)
+
+def _join_adjacent_strings(parts):
+    """Merge each run of consecutive strings in parts into a single string,
+    dropping any that are empty, so that Fn::Join gets as few items as possible."""
+    joined = []
+    strings = []
+    for part in parts:
+        if isinstance(part, str):
+            strings.append(part)
+            continue
+        if strings:
+            string = ''.join(strings)
+            if string:
+                joined.append(string)
+            strings = []
+        joined.append(part)
+    string = ''.join(strings)
+    if string:
+        joined.append(string)
+    return joined
+
+def cloudformation(service, resource, force_region=None, force_account=None):
+    """Output an object to build the ARN, suitable for use in a CloudFormation template.
+    Unlike the other functions in this module, the resource can be specified as a list
+    of parts, which will be joined without a separator. For example:
+    aws_arn.cloudformation('dynamodb', ['table/', {'Ref': 'MyTable'}])
+    """
+    
+    if isinstance(resource, str):
+        resource = [resource]
+    
+    if isinstance(resource[0], str):
+        resource_for_config = resource[0]
+    else:
+        resource_for_config = ''
+    
+    arn_has_region, arn_has_account = arn_config(service, resource_for_config, force_region, force_account)
+    
+    # the cached prefix is shared, so give each template its own Ref dicts
+    parts = [dict(part) if isinstance(part, dict) else part
+             for part in _cfn_prefix(service, arn_has_region, arn_has_account)]
+    
     parts.extend(resource)
     
     return {
         'Fn::Join': [
             '',
-            parts
+            _join_adjacent_strings(parts)
         ]
     }
     
@@ -256,7 +374,7 @@ def main():
                      force_region=force_region, force_account=force_account,
                      on_error=sys.exit)
     
-    six.print_(arn_string)
+    print(arn_string)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -13,6 +13,7 @@ setup(
     version=get_version('aws_arn'),
     description='Create properly formatted AWS ARNs according to service rules',
     packages=["aws_arn"],
+    python_requires='>=3.9',
     package_data={
         "aws_arn": ["config.json", "_version"]
     },
@@ -32,8 +33,7 @@ setup(
         'Intended Audience :: Developers',
         'Natural Language :: English',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
+        'Programming Language :: Python :: 3',
         'License :: OSI Approved :: Apache Software License',
     ),
     keywords='aws arn',